@@ -2,6 +2,7 @@
 import sqlite3
 
 DB_PATH = "wells.sqlite"
+SQLITE_PRAGMAS = "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-64000;"
 
 NEW_COLS = [
     ("drillingedge_url", "TEXT"),
@@ -13,16 +14,20 @@ NEW_COLS = [
     ("latest_prod_label", "TEXT")  # e.g. "May 2023" or "Dec 2025"
 ]
 
-def col_exists(cur, table, col):
+def existing_cols(cur, table):
     cur.execute("PRAGMA table_info(%s)" % table)
-    cols = [r[1] for r in cur.fetchall()]
-    return col in cols
+    return {r[1] for r in cur.fetchall()}
 
 con = sqlite3.connect(DB_PATH)
+con.executescript(SQLITE_PRAGMAS)
 cur = con.cursor()
 
+existing = existing_cols(cur, "wells")
+# sqlite3 doesn't open a transaction for DDL on its own, so each ALTER would
+# commit separately; run them all in one
+cur.execute("BEGIN")
 for col, typ in NEW_COLS:
-    if not col_exists(cur, "wells", col):
+    if col not in existing:
         cur.execute("ALTER TABLE wells ADD COLUMN %s %s" % (col, typ))
         print("Added:", col)
     else:
@@ -1,10 +1,18 @@
 import os
-import re
 import time
 import json
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import ahocorasick
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from pdf2image import convert_from_path, pdfinfo_from_path
+os.environ.setdefault("OMP_THREAD_LIMIT", "4")  # must be set before tesseract loads
+from tesserocr import PyTessBaseAPI
 
 # =======================
 # CONFIG (EDIT THESE)
@@ -16,6 +24,13 @@ PSM = 6                                   # good for blocks/tables
 OEM = 1                                   # LSTM engine
 BATCH_SIZE = 6                            # pages per poppler call (bigger = faster, but uses more RAM)
 MAX_PAGES = None                          # set to e.g. 50 for quick test; None = all pages
+RENDER_AHEAD = 2                          # batches poppler may render ahead of OCR
+OCR_THREADS = max(1, (os.cpu_count() or 1) // 4)  # tesseract instances run in parallel (each up to 4 OMP threads)
+TESS_VARIABLES = {
+    "user_defined_dpi": str(DPI),         # we know the render DPI; skip tesseract's guess
+    "preserve_interword_spaces": "1",     # keep table columns apart
+    "tessedit_do_invert": "0",            # scans are dark-on-light; skip the inverted pass
+}
 
 # keywords you care about
 WELL_KEYWORDS = [
@@ -31,6 +46,13 @@ STIM_KEYWORDS = [
     "bbls/min", "acid %", "mesh", "proppant", "date stimulated", "Stimulated Formation","Top (Ft)","Bottom(Ft)","Stimulation Stages",
 "Volume","volume units","type treatment","lbs proppant", "maximum treatment pressure (PSI)", "maximum treatment rate (BBLS/Min)"]
 
+# one automaton over all keyword lists -> single pass per page
+KEYWORD_AC = ahocorasick.Automaton()
+for _cat, _keywords in (("well", WELL_KEYWORDS), ("coord", COORD_KEYWORDS), ("stim", STIM_KEYWORDS)):
+    for _kw in _keywords:
+        KEYWORD_AC.add_word(_kw.lower(), (_cat, _kw.lower()))
+KEYWORD_AC.make_automaton()
+
 # =======================
 # HELPERS
 # =======================
@@ -38,6 +60,17 @@ def ensure_dir(p):
     if not os.path.exists(p):
         os.makedirs(p)
 
+def write_json(path, data):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+def json_line(obj):
+    return (orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)) + "\n"
+
 def chunk_ranges(n_pages, batch_size):
     """Yield (start, end) inclusive ranges for 0-index pages."""
     start = 0
@@ -46,28 +79,58 @@ def chunk_ranges(n_pages, batch_size):
         yield start, end
         start = end + 1
 
-def score_keywords(text, keywords):
-    t = (text or "").lower()
-    return [k for k in keywords if k in t]
-
-def ocr_images(images):
-    cfg = f"--oem {OEM} --psm {PSM}"
-    texts = []
-    for img in images:
-        texts.append(pytesseract.image_to_string(img, config=cfg))
-    return texts
+def score_keywords(text):
+    """Return {category: sorted keyword hits} from one scan of the page text."""
+    hits = {"well": set(), "coord": set(), "stim": set()}
+    for _, (cat, kw) in KEYWORD_AC.iter((text or "").lower()):
+        hits[cat].add(kw)
+    return {cat: sorted(kws) for cat, kws in hits.items()}
+
+def render_batches(n_pages, out_q):
+    """Producer thread: render each batch to its own temp dir and queue (start, tmpdir, paths)."""
+    try:
+        for start, end in chunk_ranges(n_pages, BATCH_SIZE):
+            # pdf2image uses 1-indexed first/last page; render to disk so only
+            # one page image is decoded in memory at a time
+            tmp = tempfile.TemporaryDirectory()
+            paths = convert_from_path(
+                PDF_PATH,
+                dpi=DPI,
+                first_page=start + 1,
+                last_page=end + 1,
+                output_folder=tmp.name,
+                paths_only=True,
+                fmt="png",
+                grayscale=True,
+                thread_count=os.cpu_count() or 1
+            )
+            out_q.put((start, tmp, paths))
+        out_q.put(None)
+    except Exception as exc:
+        out_q.put(exc)
+
+def ocr_file(apis, path):
+    # a tesseract API is not thread-safe: borrow one from the pool for this page
+    api = apis.get()
+    try:
+        api.SetImageFile(path)
+        return api.GetUTF8Text()
+    finally:
+        apis.put(api)
+
+def ocr_images(executor, apis, image_paths):
+    """OCR rendered page files on the thread pool; tesseract releases the GIL while recognizing."""
+    return list(executor.map(lambda path: ocr_file(apis, path), image_paths))
 
 # =======================
 # MAIN
 # =======================
 def main():
     ensure_dir(OUT_DIR)
-    txt_dir = os.path.join(OUT_DIR, "pages")
-    ensure_dir(txt_dir)
+    pages_path = os.path.join(OUT_DIR, "pages.jsonl")  # one {"page", "text"} record per line
 
-    # get page count cheaply
-    with pdfplumber.open(PDF_PATH) as pdf:
-        n_pages = len(pdf.pages)
+    # get page count cheaply (pdfinfo, no page tree parse)
+    n_pages = pdfinfo_from_path(PDF_PATH)["Pages"]
 
     if MAX_PAGES is not None:
         n_pages = min(n_pages, MAX_PAGES)
@@ -79,53 +142,63 @@ def main():
     index = []  # list of dicts: page, matches, snippet
     t0 = time.time()
 
-    for start, end in chunk_ranges(n_pages, BATCH_SIZE):
-        # pdf2image uses 1-indexed first/last page
-        images = convert_from_path(
-            PDF_PATH,
-            dpi=DPI,
-            first_page=start + 1,
-            last_page=end + 1
-        )
-
-        texts = ocr_images(images)
-
-        for offset, text in enumerate(texts):
-            page_i = start + offset
-            out_path = os.path.join(txt_dir, f"ocr_page_{page_i:03d}.txt")
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(text)
-
-            well_hits = score_keywords(text, WELL_KEYWORDS)
-            coord_hits = score_keywords(text, COORD_KEYWORDS)
-            stim_hits = score_keywords(text, STIM_KEYWORDS)
-
-            entry = {
-                "page": page_i,
-                "well_hits": well_hits,
-                "coord_hits": coord_hits,
-                "stim_hits": stim_hits,
-                "snippet": (re.sub(r"\s+", " ", text).strip()[:240] if text else "")
-            }
-            index.append(entry)
-
-            # Print progress and interesting hits
-            if (page_i % 10) == 0:
-                elapsed = time.time() - t0
-                print(f"page {page_i:03d}/{n_pages-1:03d}  elapsed={elapsed:.1f}s")
-
-            if len(well_hits) >= 2 or len(coord_hits) >= 2 or len(stim_hits) >= 2:
-                print(f"\n=== HIT page {page_i} ===")
-                if well_hits:  print("  WELL:", well_hits)
-                if coord_hits: print("  COORD:", coord_hits)
-                if stim_hits:  print("  STIM:", stim_hits)
-                print("  snippet:", entry["snippet"])
-                print("  file:", out_path)
+    # one resident tesseract per OCR thread (model stays loaded)
+    apis = queue.Queue()
+    for _ in range(OCR_THREADS):
+        apis.put(PyTessBaseAPI(psm=PSM, oem=OEM, variables=TESS_VARIABLES))
+
+    # render the next batches while the current one is OCR'd
+    batches = queue.Queue(maxsize=RENDER_AHEAD)
+    threading.Thread(target=render_batches, args=(n_pages, batches), daemon=True).start()
+
+    with ThreadPoolExecutor(max_workers=OCR_THREADS) as executor, open(pages_path, "w", encoding="utf-8") as pages_f:
+        while True:
+            item = batches.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            start, tmp, paths = item
+            with tmp:
+                texts = ocr_images(executor, apis, paths)
+
+            for offset, text in enumerate(texts):
+                page_i = start + offset
+                pages_f.write(json_line({"page": page_i, "text": text}))
+
+                hits = score_keywords(text)
+                well_hits = hits["well"]
+                coord_hits = hits["coord"]
+                stim_hits = hits["stim"]
+
+                entry = {
+                    "page": page_i,
+                    "well_hits": well_hits,
+                    "coord_hits": coord_hits,
+                    "stim_hits": stim_hits,
+                    "snippet": (" ".join(text[:1200].split())[:240] if text else "")
+                }
+                index.append(entry)
+
+                # Print progress and interesting hits
+                if (page_i % 10) == 0:
+                    elapsed = time.time() - t0
+                    print(f"page {page_i:03d}/{n_pages-1:03d}  elapsed={elapsed:.1f}s")
+
+                if len(well_hits) >= 2 or len(coord_hits) >= 2 or len(stim_hits) >= 2:
+                    print(f"\n=== HIT page {page_i} ===")
+                    if well_hits:  print("  WELL:", well_hits)
+                    if coord_hits: print("  COORD:", coord_hits)
+                    if stim_hits:  print("  STIM:", stim_hits)
+                    print("  snippet:", entry["snippet"])
+                    print("  file:", pages_path)
+
+    while not apis.empty():
+        apis.get().End()
 
     # Write full index JSON
     index_path = os.path.join(OUT_DIR, "index.json")
-    with open(index_path, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
+    write_json(index_path, index)
 
     # Write human summary
     summary_lines = []
@@ -144,7 +217,7 @@ def main():
         f.write("\n".join(summary_lines))
 
     print("\nDONE.")
-    print("All OCR text saved in:", txt_dir)
+    print("All OCR text saved in:", pages_path)
     print("Index JSON:", index_path)
     print("Summary:", summary_path)
     print("Likely STIM pages:", stim_pages)
@@ -1,14 +1,31 @@
 import re
-import time
+import asyncio
 import sqlite3
-from urllib.parse import quote
+from urllib.parse import urljoin
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 
 DB_PATH = "wells.sqlite"
+SQLITE_PRAGMAS = "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-64000;"
 SEARCH_URL = "https://www.drillingedge.com/search"
+COMMIT_EVERY = 100  # rows per UPDATE batch / commit
+CONCURRENCY = 10    # wells looked up at once
+POLITE_DELAY = 1.0  # seconds each worker waits after a lookup
+
+NON_DIGIT_RE = re.compile(r"\D")
+
+OIL_RE = re.compile(r"([\d.]+)\s*(k)?\s*Barrels of Oil Produced in\s+([A-Za-z]{3}\s+\d{4})", re.I)
+GAS_RE = re.compile(r"([\d.]+)\s*(k)?\s*MCF of Gas Produced in\s+([A-Za-z]{3}\s+\d{4})", re.I)
+# one search per field: the value class accepts spaces/digits, so a single
+# alternation would let one field's value swallow the next key
+DETAIL_KEYS = {
+    "well_status": "Well Status",
+    "well_type": "Well Type",
+    "closest_city": "Closest City",
+}
+DETAIL_RES = {field: re.compile(r"%s\s+([A-Za-z0-9 &/.-]+)" % re.escape(key), re.I)
+              for field, key in DETAIL_KEYS.items()}
 
 # ---------- helpers ----------
 def normalize_api(api_raw):
@@ -18,190 +35,172 @@ def normalize_api(api_raw):
     """
     if not api_raw:
         return None
-    api_raw = re.sub(r"\D", "", str(api_raw))
+    api_raw = NON_DIGIT_RE.sub("", str(api_raw))
     if len(api_raw) == 10:
         return api_raw[0:2] + "-" + api_raw[2:5] + "-" + api_raw[5:10]
     return None
 
-def parse_oil_gas_numbers(page_text):
-    """
-    Examples seen on DrillingEdge well pages:
-      "396 Barrels of Oil Produced in Dec 2025"
-      "1 k MCF of Gas Produced in Dec 2025"
-      "2.2 k MCF of Gas Produced in May 2023"
-    Returns (oil_bbl, gas_mcf, label)
-    """
-    t = page_text
-
-    # Oil
-    oil = None
-    oil_label = None
-    m = re.search(r"([\d.]+)\s*(k)?\s*Barrels of Oil Produced in\s+([A-Za-z]{3}\s+\d{4})", t, re.I)
-    if m:
-        val = float(m.group(1))
-        if m.group(2):  # 'k'
-            val *= 1000.0
-        oil = val
-        oil_label = m.group(3)
-
-    # Gas
-    gas = None
-    gas_label = None
-    m = re.search(r"([\d.]+)\s*(k)?\s*MCF of Gas Produced in\s+([A-Za-z]{3}\s+\d{4})", t, re.I)
-    if m:
-        val = float(m.group(1))
-        if m.group(2):
-            val *= 1000.0
-        gas = val
-        gas_label = m.group(3)
-
-    # pick label if we have one
-    label = oil_label or gas_label
-    return oil, gas, label
+def production_value(m):
+    """(amount, month label) from an oil/gas match; "2.2 k" means 2200."""
+    val = float(m.group(1))
+    if m.group(2):  # 'k'
+        val *= 1000.0
+    return val, m.group(3)
 
-def find_detail_value_in_text(page_text, key):
+def parse_well_page(page_text):
     """
     Works because the public page often contains lines like:
       "Well Status Active"
       "Well Type Oil & Gas"
       "Closest City Williston"
+      "396 Barrels of Oil Produced in Dec 2025"
+      "2.2 k MCF of Gas Produced in May 2023"
+    Each field takes its first hit in the page text.
     """
-    # Grab value after key until newline
-    pattern = r"%s\s+([A-Za-z0-9 &/.-]+)" % re.escape(key)
-    m = re.search(pattern, page_text, re.I)
-    return m.group(1).strip() if m else None
-
-# ---------- selenium setup ----------
-def make_driver(chromedriver_path=None, headless=True):
-    opts = Options()
-    if headless:
-        # for newer Chrome
-        opts.add_argument("--headless=new")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--window-size=1400,900")
-
-    if chromedriver_path:
-        driver = webdriver.Chrome(executable_path=chromedriver_path, options=opts)
-    else:
-        driver = webdriver.Chrome(options=opts)  # uses PATH
-    driver.set_page_load_timeout(60)
-    return driver
+    out = {}
+    for field, pat in DETAIL_RES.items():
+        m = pat.search(page_text)
+        # value runs after the key until newline
+        out[field] = m.group(1).strip() if m else None
+
+    m = OIL_RE.search(page_text)
+    oil, oil_label = production_value(m) if m else (None, None)
+    m = GAS_RE.search(page_text)
+    gas, gas_label = production_value(m) if m else (None, None)
+    out["latest_oil_bbl"] = oil
+    out["latest_gas_mcf"] = gas
+    # pick label if we have one
+    out["latest_prod_label"] = oil_label or gas_label
+    return out
+
+# ---------- http setup ----------
+def make_client():
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=60.0,
+        headers={"User-Agent": "Mozilla/5.0"},
+    )
+
+def page_text_of(html):
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style", "noscript"])
+    body = tree.body
+    return body.text(separator="\n") if body is not None else ""
 
 # ---------- scraping ----------
-def drillingedge_lookup(driver, api_dashed=None, well_name=None):
+async def drillingedge_lookup(client, api_dashed=None, well_name=None):
     """
-    1) open /search
-    2) fill API field (best) else Well Name
-    3) submit
-    4) click the result row that matches API
-    5) parse details page
+    1) GET /search with the API number (best) else the well name
+    2) pick the result link that matches the API
+    3) GET the well details page
+    4) parse details from the page text
     """
-    driver.get(SEARCH_URL)
-    time.sleep(1.0)
-
-    # Fill API or well name. (The search page has multiple inputs; we target by placeholder-ish labels.)
+    # same fields the search form submits
     if api_dashed:
-        # Find the API input by looking for input elements and picking the one near "API"
-        inputs = driver.find_elements(By.TAG_NAME, "input")
-        api_input = None
-        for inp in inputs:
-            try:
-                ph = (inp.get_attribute("placeholder") or "").lower()
-                name = (inp.get_attribute("name") or "").lower()
-                # heuristics
-                if "api" in ph or "api" in name:
-                    api_input = inp
-                    break
-            except:
-                pass
-
-        # Fallback: just pick the 3rd input (site layout tends to be stable but not guaranteed)
-        if api_input is None and len(inputs) >= 3:
-            api_input = inputs[2]
-
-        if api_input is None:
-            return None
-
-        api_input.clear()
-        api_input.send_keys(api_dashed)
-
+        params = {"type": "wells", "api_no": api_dashed}
     elif well_name:
-        inputs = driver.find_elements(By.TAG_NAME, "input")
-        if not inputs:
-            return None
-        # guess "well name" input is one of the first fields
-        well_input = inputs[1] if len(inputs) > 1 else inputs[0]
-        well_input.clear()
-        well_input.send_keys(well_name)
-
+        params = {"type": "wells", "well_name": well_name}
     else:
         return None
 
-    # Click Search button (there should be a button or input submit)
-    # We'll try common candidates:
-    buttons = driver.find_elements(By.TAG_NAME, "button")
-    clicked = False
-    for b in buttons:
-        txt = (b.text or "").strip().lower()
-        if "search" in txt:
-            b.click()
-            clicked = True
-            break
-    if not clicked:
-        # try pressing enter in the last focused input
-        api_input = driver.switch_to.active_element
-        api_input.send_keys("\n")
-
-    time.sleep(2.0)
-
-    # Search results table has links; click the best match
-    links = driver.find_elements(By.TAG_NAME, "a")
+    r = await client.get(SEARCH_URL, params=params)
+    r.raise_for_status()
+    tree = LexborHTMLParser(r.text)
+
+    # Search results table has links; take the one carrying the API,
+    # else the first well detail link
     best = None
     if api_dashed:
-        for a in links:
-            href = a.get_attribute("href") or ""
-            if api_dashed in href:
-                best = a
-                break
-
-    # fallback: click the first "API #" link-looking result
+        best = tree.css_first('a[href*="/wells/"][href*="%s"]' % api_dashed)
     if best is None:
-        for a in links:
-            href = a.get_attribute("href") or ""
-            if "/wells/" in href and "drillingedge.com" in href:
-                best = a
-                break
+        best = tree.css_first('a[href*="/wells/"]')
 
-    if best is None:
+    if best is None or not best.attributes.get("href"):
         return None
 
-    url = best.get_attribute("href")
-    best.click()
-    time.sleep(2.0)
+    url = urljoin(str(r.url), best.attributes["href"])
+
+    r = await client.get(url)
+    r.raise_for_status()
 
     # Now parse the detail page (use page text)
-    page_text = driver.find_element(By.TAG_NAME, "body").text
+    page_text = page_text_of(r.text)
+
+    data = {"drillingedge_url": url}
+    data.update(parse_well_page(page_text))
+    return data
 
-    well_status = find_detail_value_in_text(page_text, "Well Status")
-    well_type = find_detail_value_in_text(page_text, "Well Type")
-    closest_city = find_detail_value_in_text(page_text, "Closest City")
+# ---------- DB loop ----------
+UPDATE_SQL = """
+    UPDATE wells
+    SET drillingedge_url=?,
+        well_status=?,
+        well_type=?,
+        closest_city=?,
+        latest_oil_bbl=?,
+        latest_gas_mcf=?,
+        latest_prod_label=?
+    WHERE id=?
+"""
+
+def flush_updates(con, batch):
+    if batch:
+        con.executemany(UPDATE_SQL, batch)
+        con.commit()
+        batch.clear()
+
+async def lookup_row(client, sem, r):
+    api_dashed = normalize_api(r["api"])
+    well_name = r["well_name"]
+    async with sem:
+        try:
+            data = await drillingedge_lookup(client, api_dashed=api_dashed, well_name=well_name)
+        except httpx.HTTPError as exc:
+            print("Lookup failed:", r["id"], api_dashed, type(exc).__name__, exc)
+            data = None
+        # be polite to the site
+        await asyncio.sleep(POLITE_DELAY)
+    return r, api_dashed, data
+
+async def enrich(con, rows):
+    sem = asyncio.Semaphore(CONCURRENCY)
+    batch = []
 
-    oil_bbl, gas_mcf, label = parse_oil_gas_numbers(page_text)
+    try:
+        async with make_client() as client:
+            tasks = [lookup_row(client, sem, r) for r in rows]
+            for fut in asyncio.as_completed(tasks):
+                r, api_dashed, data = await fut
+
+                print("\n---", r["id"], api_dashed, r["well_name"], "---")
+
+                if not data:
+                    print("No results")
+                    continue
+
+                batch.append((
+                    data.get("drillingedge_url"),
+                    data.get("well_status"),
+                    data.get("well_type"),
+                    data.get("closest_city"),
+                    data.get("latest_oil_bbl"),
+                    data.get("latest_gas_mcf"),
+                    data.get("latest_prod_label"),
+                    r["id"]
+                ))
+                if len(batch) >= COMMIT_EVERY:
+                    flush_updates(con, batch)
+
+                print("Saved:", data)
 
-    return {
-        "drillingedge_url": url,
-        "well_status": well_status,
-        "well_type": well_type,
-        "closest_city": closest_city,
-        "latest_oil_bbl": oil_bbl,
-        "latest_gas_mcf": gas_mcf,
-        "latest_prod_label": label
-    }
+    finally:
+        # keep whatever was scraped even if the loop died part-way
+        flush_updates(con, batch)
 
-# ---------- DB loop ----------
-def main(chromedriver_path=None):
+def main():
     con = sqlite3.connect(DB_PATH)
+    con.executescript(SQLITE_PRAGMAS)
     con.row_factory = sqlite3.Row
     cur = con.cursor()
 
@@ -212,52 +211,10 @@ def main(chromedriver_path=None):
         ORDER BY id
     """).fetchall()
 
-    driver = make_driver(chromedriver_path=chromedriver_path, headless=True)
-
     try:
-        for r in rows:
-            api_dashed = normalize_api(r["api"])
-            well_name = r["well_name"]
-
-            print("\n---", r["id"], api_dashed, well_name, "---")
-
-            data = drillingedge_lookup(driver, api_dashed=api_dashed, well_name=well_name)
-            if not data:
-                print("No results")
-                continue
-
-            cur.execute("""
-                UPDATE wells
-                SET drillingedge_url=?,
-                    well_status=?,
-                    well_type=?,
-                    closest_city=?,
-                    latest_oil_bbl=?,
-                    latest_gas_mcf=?,
-                    latest_prod_label=?
-                WHERE id=?
-            """, (
-                data.get("drillingedge_url"),
-                data.get("well_status"),
-                data.get("well_type"),
-                data.get("closest_city"),
-                data.get("latest_oil_bbl"),
-                data.get("latest_gas_mcf"),
-                data.get("latest_prod_label"),
-                r["id"]
-            ))
-            con.commit()
-
-            print("Saved:", data)
-
-            # be polite to the site
-            time.sleep(1.0)
-
+        asyncio.run(enrich(con, rows))
     finally:
-        driver.quit()
         con.close()
 
 if __name__ == "__main__":
-    # If chromedriver is NOT on PATH, set a full path here:
-    # main(chromedriver_path="/usr/local/bin/chromedriver")
-    main()
\ No newline at end of file
+    main()
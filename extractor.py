@@ -1,8 +1,13 @@
 import json
 import sys
+import hashlib
+import tempfile
 import os
+import shutil
 import re
 import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Optional, List, Dict, Tuple
 try:
@@ -15,24 +20,54 @@ except Exception:
 if pypdf is None:
     print('ERROR: pypdf or PyPDF2 is required. Install with: pip install pypdf')
     sys.exit(1)
+try:
+    import pypdfium2 as pdfium
+except Exception:
+    pdfium = None
+try:
+    import orjson
+except Exception:
+    orjson = None
+try:
+    import cv2
+    import numpy as np
+    from PIL import Image
+except Exception:
+    cv2 = None
 try:
     from pdf2image import convert_from_path
-    import pytesseract
+    from PIL import ImageOps
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+    TESS_PSM = PSM.SINGLE_BLOCK
+    TESS_OEM = OEM.LSTM_ONLY
     OCR_AVAILABLE = True
 except Exception:
     OCR_AVAILABLE = False
 PDF_DIR = Path('DSCI560_Lab5/data')
 OUTPUT_DIR = Path('extracted_data')
 MIN_TEXT_CHARS_PER_PAGE = 60
-OCR_DPI = 300
+OCR_DPI = 250  # stim tables stay legible; ~30% fewer pixels than 300
+OCR_BATCH_PAGES = 8  # max pages rendered per poppler call
+MAX_OCR_PAGES = None  # e.g. 60 to bound OCR per PDF (first pages win); None = OCR every page that needs it
+OCR_CACHE_DIR = Path('.ocrcache')  # <sha1 of pdf>/<ocr settings fingerprint>/<page>.txt, reused across runs
+OCR_CACHE_MAX_BYTES = 512 * 1024 * 1024  # oldest PDFs are evicted past this; None = unbounded
+OCR_CACHE_VERSION = 1  # bump when OCR preprocessing changes in a way the fingerprint can't see
+CROP_PAD = 20  # px kept around the printed area by crop_to_content
+TESS_VARIABLES = {'user_defined_dpi': str(OCR_DPI), 'preserve_interword_spaces': '1', 'tessedit_do_invert': '0'}
+_TESS_API = None
+_UNSAFE_FILENAME_CHARS = re.compile('[<>:"/\\\\|?*\\x00-\\x1f]')
+_FILENAME_SPACING = re.compile('[\\s_]+')
+_API_SUFFIX = re.compile('\\s+API\\s*:.*$', re.I)
+_NORTH_DAKOTA = re.compile('North\\s+Dakota', re.I)
 
 def sanitize_filename(name: str) -> str:
-    safe = re.sub('[<>:"/\\\\|?*\\x00-\\x1f]', '_', name)
-    safe = re.sub('[\\s_]+', ' ', safe).strip()
+    safe = _UNSAFE_FILENAME_CHARS.sub('_', name)
+    safe = _FILENAME_SPACING.sub(' ', safe).strip()
     return safe[:150] if safe else 'UNKNOWN'
 
 def normalize_spaces(s: str) -> str:
-    return re.sub('[\\s\\u00a0]+', ' ', s or '').strip()
+    # str.split() already treats \u00a0 (and all other unicode whitespace) as a separator
+    return ' '.join((s or '').split())
 
 def to_int(s):
     if not s:
@@ -59,22 +94,108 @@ def dms_to_decimal(deg: float, minutes: float, seconds: float, hemi: str) -> flo
         value *= -1.0
     return value
 
-def ocr_page(pdf_path: Path, page_number_1_indexed: int) -> str:
-    if not OCR_AVAILABLE:
-        return ''
-    images = convert_from_path(str(pdf_path), dpi=OCR_DPI, first_page=page_number_1_indexed, last_page=page_number_1_indexed)
-    if not images:
-        return ''
-    config = '--psm 6'
-    text = pytesseract.image_to_string(images[0], config=config)
-    return text or ''
+def get_tess_api():
+    global _TESS_API
+    if _TESS_API is None:
+        _TESS_API = PyTessBaseAPI(psm=TESS_PSM, oem=TESS_OEM, variables=TESS_VARIABLES)
+    return _TESS_API
+
+def crop_to_content(img, pad=CROP_PAD):
+    # drop blank margins: fewer pixels for Tesseract without cutting anything printed on the page
+    ink = ImageOps.invert(img.convert('L')).point(lambda v: 255 if v > 64 else 0)
+    bbox = ink.getbbox()
+    if bbox is None:
+        return img
+    left, top, right, bottom = bbox
+    return img.crop((max(0, left - pad), max(0, top - pad), min(img.width, right + pad), min(img.height, bottom + pad)))
+
+def binarize(img):
+    # Otsu threshold to 1-bit up front; Tesseract skips its own thresholding on binary input
+    if cv2 is None:
+        return img
+    _, bw = cv2.threshold(np.asarray(img.convert('L')), 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    return Image.fromarray(bw).convert('1')
+
+def page_ranges(page_numbers, max_len):
+    ranges = []
+    for n in sorted(page_numbers):
+        if ranges and n == ranges[-1][1] + 1 and n - ranges[-1][0] < max_len:
+            ranges[-1][1] = n
+        else:
+            ranges.append([n, n])
+    return ranges
+
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def ocr_fingerprint():
+    # everything that changes OCR output, so cached text from another pipeline is never reused
+    settings = {'version': OCR_CACHE_VERSION, 'dpi': OCR_DPI, 'grayscale': True, 'psm': int(TESS_PSM), 'oem': int(TESS_OEM), 'variables': TESS_VARIABLES, 'crop_pad': CROP_PAD, 'otsu': cv2 is not None}
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+def prune_ocr_cache(max_bytes=OCR_CACHE_MAX_BYTES):
+    # run once from main before the workers start, so nothing is writing while we delete
+    if not OCR_CACHE_DIR.is_dir():
+        return
+    current = ocr_fingerprint()
+    entries = []
+    for pdf_dir in OCR_CACHE_DIR.iterdir():
+        if not pdf_dir.is_dir():
+            continue
+        # text OCR'd with other settings can never be read again
+        for fp_dir in pdf_dir.iterdir():
+            if fp_dir.name != current:
+                shutil.rmtree(fp_dir, ignore_errors=True)
+        files = [f for f in pdf_dir.rglob('*') if f.is_file()]
+        size = sum(f.stat().st_size for f in files)
+        written = max((f.stat().st_mtime for f in files), default=0)
+        entries.append((written, size, pdf_dir))
+    if max_bytes is None:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, pdf_dir in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(pdf_dir, ignore_errors=True)
+        total -= size
+
+def ocr_pages(pdf_path: Path, page_numbers_1_indexed) -> Dict[int, str]:
+    if not OCR_AVAILABLE or not page_numbers_1_indexed:
+        return {}
+    cache_dir = OCR_CACHE_DIR / file_sha1(pdf_path) / ocr_fingerprint()
+    texts = {}
+    missing = []
+    for n in page_numbers_1_indexed:
+        cached = cache_dir / f'{n}.txt'
+        if cached.exists():
+            texts[n] = cached.read_text(encoding='utf-8')
+        else:
+            missing.append(n)
+    if missing:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    # one poppler call per run of consecutive pages instead of one per page
+    for first, last in page_ranges(missing, OCR_BATCH_PAGES):
+        images = convert_from_path(str(pdf_path), dpi=OCR_DPI, first_page=first, last_page=last, grayscale=True)
+        api = get_tess_api()
+        for n, img in zip(range(first, last + 1), images):
+            api.SetImage(binarize(crop_to_content(img)))
+            texts[n] = api.GetUTF8Text() or ''
+            # write-then-rename so an interrupted run never leaves a truncated entry; the temp
+            # name is unique so workers OCRing identical PDFs don't clobber each other's file
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir, suffix='.tmp', delete=False) as tmp:
+                tmp.write(texts[n])
+            os.replace(tmp.name, cache_dir / f'{n}.txt')
+    return texts
 WELL_NAME_PATTERNS = [re.compile('Well\\s+Name\\s+and\\s+Number\\s*\\n\\s*([^\\n]+)', re.I), re.compile('Well\\s+Name\\s*:\\s*([^\\n]+)', re.I), re.compile('Official\\s+Well\\s+Name\\s*:\\s*([^\\n]+)', re.I)]
 API_PATTERNS = [re.compile('\\b(\\d{2}-\\d{3}-\\d{5})\\b'), re.compile('\\b(\\d{2}-\\d{3}-\\d{5,})\\b')]
 OPERATOR_PATTERNS = [re.compile('\\bOperator\\s*\\n\\s*([^\\n]+)', re.I), re.compile('\\bOperator\\s*:\\s*([^\\n]+)', re.I)]
 COUNTY_PATTERNS = [re.compile('\\bCounty\\s*\\n\\s*([A-Za-z]+)', re.I), re.compile('\\bCounty\\s*:\\s*([A-Za-z]+)', re.I), re.compile('\\bCounty\\s*([A-Za-z]+)\\b', re.I)]
 STATE_PATTERNS = [re.compile('\\bState\\s*\\n\\s*([A-Z]{2})\\b', re.I)]
-DMS_LAT = re.compile("(\\d{1,2})\\s*°\\s*(\\d{1,2})\\s*'\\s*([\\d.]+)\\s*([NS])", re.I)
-DMS_LON = re.compile("(\\d{1,3})\\s*°\\s*(\\d{1,2})\\s*'\\s*([\\d.]+)\\s*([EW])", re.I)
+DMS_COORD = re.compile("(?P<d>\\d{1,3})\\s*°\\s*(?P<m>\\d{1,2})\\s*'\\s*(?P<s>[\\d.]+)\\s*(?P<h>[NSEW])", re.I)
 
 def find_first(patterns, text):
     for pat in patterns:
@@ -84,65 +205,68 @@ def find_first(patterns, text):
     return None
 
 def extract_lat_lon(text):
-    lat_matches = list(DMS_LAT.finditer(text))
-    lon_matches = list(DMS_LON.finditer(text))
+    # single pass; the last N/S and last E/W coordinates win
     lat = lon = None
-    if lat_matches:
-        m = lat_matches[-1]
-        lat = dms_to_decimal(float(m.group(1)), float(m.group(2)), float(m.group(3)), m.group(4))
-    if lon_matches:
-        m = lon_matches[-1]
-        lon = dms_to_decimal(float(m.group(1)), float(m.group(2)), float(m.group(3)), m.group(4))
+    for m in DMS_COORD.finditer(text):
+        hemi = m.group('h').upper()
+        if hemi in ('N', 'S'):
+            lat = m
+        else:
+            lon = m
+    if lat is not None:
+        # latitude degrees are at most two digits
+        lat = dms_to_decimal(float(lat.group('d')[-2:]), float(lat.group('m')), float(lat.group('s')), lat.group('h'))
+    if lon is not None:
+        lon = dms_to_decimal(float(lon.group('d')), float(lon.group('m')), float(lon.group('s')), lon.group('h'))
     return (lat, lon)
 _STIM_HDR = re.compile('Well\\s+Specific\\s+Stimulat|Date\\s+Stimulat', re.I)
+_OCR_GATE = re.compile('(?P<stim>Well\\s+Specific\\s+Stimulat|Date\\s+Stimulat)|(?P<date>\\d{1,2}/\\d{1,2}/\\d{4})', re.I)
 _TREAT_HDR = re.compile('Type\\s+Treatment', re.I)
 _DETAILS = re.compile('^Details\\s*$', re.I)
-_STIM_ROW = re.compile('(\\d{1,2}/\\d{1,2}/\\d{4})\\s+([A-Za-z][A-Za-z ]{1,40}?)\\s+(\\d{3,6})\\s+(\\d{3,6})\\s+(\\d{1,3})\\s+([\\d,]+)\\s+([A-Za-z]+)')
-_TREAT_LINE = re.compile('^([A-Za-z][A-Za-z ]{1,30}?)\\s+([\\d,]+)(?:\\s+([\\d,]+))?(?:\\s+([\\d.]+))?(?:\\s+([\\d.]+))?$')
-_PROPPANT_DETAIL = re.compile('^\\s*([A-Za-z0-9/ ]{2,40}?)\\s*[:\\-]\\s*([\\d,]+)\\s*$')
+# [^\S\n] keeps these single-line so they can run over the whole page text
+_STIM_ROW = re.compile('(\\d{1,2}/\\d{1,2}/\\d{4})[^\\S\\n]+([A-Za-z][A-Za-z ]{1,40}?)[^\\S\\n]+(\\d{3,6})[^\\S\\n]+(\\d{3,6})[^\\S\\n]+(\\d{1,3})[^\\S\\n]+([\\d,]+)[^\\S\\n]+([A-Za-z]+)')
+_TREAT_LINE = re.compile('^([A-Za-z][A-Za-z ]{1,30}?)[^\\S\\n]+([\\d,]+)(?:[^\\S\\n]+([\\d,]+))?(?:[^\\S\\n]+([\\d.]+))?(?:[^\\S\\n]+([\\d.]+))?$', re.M)
+_PROPPANT_DETAIL = re.compile('^[^\\S\\n]*([A-Za-z0-9/ ]{2,40}?)[^\\S\\n]*[:\\-][^\\S\\n]*([\\d,]+)[^\\S\\n]*$', re.M)
 
 def parse_stimulation_records(page_text):
     if not page_text or not _STIM_HDR.search(page_text):
         return []
-    lines = [ln.strip() for ln in page_text.splitlines() if ln.strip()]
-    records = []
-    i = 0
-    while i < len(lines):
-        ln = lines[i]
-        m = _STIM_ROW.search(ln)
-        if not m:
-            i += 1
+    text = '\n'.join((ln.strip() for ln in page_text.splitlines() if ln.strip()))
+    # row anchors: first row match on each line
+    anchors = []
+    for m in _STIM_ROW.finditer(text):
+        line_start = text.rfind('\n', 0, m.start()) + 1
+        if anchors and anchors[-1][0] == line_start:
             continue
+        anchors.append((line_start, m))
+    records = []
+    for i, (_, m) in enumerate(anchors):
         rec = {'date_stimulated': m.group(1), 'stimulated_formation': m.group(2).strip(), 'top_ft': to_int(m.group(3)), 'bottom_ft': to_int(m.group(4)), 'stimulation_stages': to_int(m.group(5)), 'volume': to_int(m.group(6)), 'volume_units': m.group(7), 'treatment_type': None, 'acid_percent': None, 'lbs_proppant': None, 'max_treatment_pressure_psi': None, 'max_treatment_rate_bbls_min': None, 'proppant_details': [], 'raw_details': None}
-        i += 1
-        raw_details = []
-        while i < len(lines) and (not _STIM_ROW.search(lines[i])):
-            cur = lines[i]
-            tm = _TREAT_LINE.match(cur)
-            if tm and (not rec['treatment_type']):
-                rec['treatment_type'] = tm.group(1).strip()
-                nums = [to_float(x) for x in tm.groups()[1:] if x is not None]
-                if len(nums) == 4:
-                    rec['acid_percent'] = nums[0]
-                    rec['lbs_proppant'] = nums[1]
-                    rec['max_treatment_pressure_psi'] = nums[2]
-                    rec['max_treatment_rate_bbls_min'] = nums[3]
-                elif len(nums) == 3:
-                    rec['lbs_proppant'] = nums[0]
-                    rec['max_treatment_pressure_psi'] = nums[1]
-                    rec['max_treatment_rate_bbls_min'] = nums[2]
-                elif len(nums) == 2:
-                    rec['lbs_proppant'] = nums[0]
-                    rec['max_treatment_pressure_psi'] = nums[1]
-                i += 1
-                continue
-            dm = _PROPPANT_DETAIL.match(cur)
-            if dm:
-                rec['proppant_details'].append({'type': normalize_spaces(dm.group(1)), 'amount': to_int(dm.group(2))})
-                i += 1
-                continue
-            raw_details.append(cur)
-            i += 1
+        # detail block: the lines between this row and the next one
+        start = text.find('\n', m.end())
+        start = len(text) if start < 0 else start + 1
+        end = anchors[i + 1][0] if i + 1 < len(anchors) else len(text)
+        block = text[start:end]
+        tm = _TREAT_LINE.search(block)
+        if tm:
+            rec['treatment_type'] = tm.group(1).strip()
+            nums = [to_float(x) for x in tm.groups()[1:] if x is not None]
+            if len(nums) == 4:
+                rec['acid_percent'] = nums[0]
+                rec['lbs_proppant'] = nums[1]
+                rec['max_treatment_pressure_psi'] = nums[2]
+                rec['max_treatment_rate_bbls_min'] = nums[3]
+            elif len(nums) == 3:
+                rec['lbs_proppant'] = nums[0]
+                rec['max_treatment_pressure_psi'] = nums[1]
+                rec['max_treatment_rate_bbls_min'] = nums[2]
+            elif len(nums) == 2:
+                rec['lbs_proppant'] = nums[0]
+                rec['max_treatment_pressure_psi'] = nums[1]
+            block = block[:tm.start()] + block[tm.end():]
+        for dm in _PROPPANT_DETAIL.finditer(block):
+            rec['proppant_details'].append({'type': normalize_spaces(dm.group(1)), 'amount': to_int(dm.group(2))})
+        raw_details = [ln for ln in _PROPPANT_DETAIL.sub('', block).split('\n') if ln]
         if raw_details:
             rec['raw_details'] = '\n'.join(raw_details)
         records.append(rec)
@@ -154,12 +278,37 @@ class PageExtract(object):
         self.method = method
         self.text = text
 
+def page_needs_ocr(text):
+    if len(text) < MIN_TEXT_CHARS_PER_PAGE:
+        return True
+    # one scan for both the stim header and a slash-date
+    looks_like_stim = False
+    for m in _OCR_GATE.finditer(text):
+        if m.lastgroup == 'date':
+            return False
+        looks_like_stim = True
+    return looks_like_stim
+
+def pdfium_page_text(doc, idx):
+    try:
+        page = doc[idx - 1]
+        textpage = page.get_textpage()
+        text = textpage.get_text_range() or ''
+        textpage.close()
+        page.close()
+        return text.replace('\r\n', '\n').strip()
+    except Exception as exc:
+        print(f'  warning: page {idx} pdfium extraction failed ({type(exc).__name__}: {exc})')
+        return ''
+
 def extract_pages(pdf_path):
     try:
         warnings.filterwarnings('ignore', category=pypdf.errors.PdfReadWarning)
     except Exception:
         warnings.filterwarnings('ignore')
     pages: list[PageExtract] = []
+    ocr_needed = []
+    pdfium_doc = None
     with open(pdf_path, 'rb') as f:
         reader = pypdf.PdfReader(f)
         for idx, page in enumerate(reader.pages, start=1):
@@ -169,30 +318,39 @@ def extract_pages(pdf_path):
                 print(f'  warning: page {idx} text extraction failed ({type(exc).__name__}: {exc})')
                 text = ''
             text = text.strip()
-            needs_ocr = len(text) < MIN_TEXT_CHARS_PER_PAGE
-            looks_like_stim = bool(_STIM_HDR.search(text))
-            has_date = bool(re.search('\\d{1,2}/\\d{1,2}/\\d{4}', text))
-            if looks_like_stim and (not has_date):
-                needs_ocr = True
-            if needs_ocr and OCR_AVAILABLE:
-                ocr_text = ocr_page(pdf_path, idx).strip()
-                if len(ocr_text) > len(text):
-                    pages.append(PageExtract(idx, 'ocr', ocr_text))
-                else:
-                    pages.append(PageExtract(idx, 'pypdf', text))
-            else:
-                pages.append(PageExtract(idx, 'pypdf', text))
+            method = 'pypdf'
+            needs_ocr = page_needs_ocr(text)
+            # second text extractor before paying for OCR; PDFium often recovers what pypdf misses
+            if needs_ocr and pdfium is not None:
+                if pdfium_doc is None:
+                    pdfium_doc = pdfium.PdfDocument(str(pdf_path))
+                alt_text = pdfium_page_text(pdfium_doc, idx)
+                if len(alt_text) > len(text):
+                    text, method = alt_text, 'pdfium'
+                    needs_ocr = page_needs_ocr(text)
+            pages.append(PageExtract(idx, method, text))
+            if needs_ocr:
+                ocr_needed.append(idx)
+    if pdfium_doc is not None:
+        pdfium_doc.close()
+    if MAX_OCR_PAGES is not None and len(ocr_needed) > MAX_OCR_PAGES:
+        print(f'  note: {len(ocr_needed)} pages need OCR, capped at {MAX_OCR_PAGES}')
+        ocr_needed = ocr_needed[:MAX_OCR_PAGES]
+    for idx, ocr_text in ocr_pages(pdf_path, ocr_needed).items():
+        ocr_text = ocr_text.strip()
+        if len(ocr_text) > len(pages[idx - 1].text):
+            pages[idx - 1] = PageExtract(idx, 'ocr', ocr_text)
     return pages
 
 def process_pdf(pdf_path):
     pages = extract_pages(pdf_path)
     full_text = '\n'.join((p.text for p in pages if p.text))
     well_name = find_first(WELL_NAME_PATTERNS, full_text) or pdf_path.stem
-    well_name = normalize_spaces(re.sub('\\s+API\\s*:.*$', '', well_name, flags=re.I))
+    well_name = normalize_spaces(_API_SUFFIX.sub('', well_name))
     api_number = find_first(API_PATTERNS, full_text)
     operator = find_first(OPERATOR_PATTERNS, full_text)
     county = find_first(COUNTY_PATTERNS, full_text)
-    state = 'ND' if re.search('North\\s+Dakota', full_text, re.I) else find_first(STATE_PATTERNS, full_text) or 'N/A'
+    state = 'ND' if _NORTH_DAKOTA.search(full_text) else find_first(STATE_PATTERNS, full_text) or 'N/A'
     latitude, longitude = extract_lat_lon(full_text)
     stim_records = []
     for p in pages:
@@ -200,6 +358,31 @@ def process_pdf(pdf_path):
     data = {'pdf_filename': pdf_path.name, 'well_name': well_name, 'api_number': api_number, 'operator': operator, 'county': county, 'state': state, 'latitude': latitude, 'longitude': longitude, 'stimulation_records': stim_records, 'pages': [{'page_number': p.page_number, 'method': p.method, 'text_char_count': len(p.text or ''), 'text': p.text} for p in pages]}
     return data
 
+def write_json(path, data):
+    if orjson is not None:
+        try:
+            # encode before opening so a failure can't leave a half-written file
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. OCR digit runs that to_int turned into ints beyond 64 bits
+            payload = None
+        if payload is not None:
+            with open(path, 'wb') as f:
+                f.write(payload)
+            return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def write_output(data):
+    print(f"\nProcessed: {data['pdf_filename']}")
+    out_name = sanitize_filename(data['well_name']) + '.json'
+    out_path = OUTPUT_DIR / out_name
+    write_json(out_path, data)
+    print(f'  -> wrote: {out_path}')
+    print(f"  well_name={data.get('well_name')}")
+    print(f"  api_number={data.get('api_number')}")
+    print(f"  stimulation_records={len(data.get('stimulation_records', []))}")
+
 def main() -> None:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     pdf_files = sorted(PDF_DIR.glob('*.pdf'))
@@ -208,18 +391,22 @@ def main() -> None:
         return
     if not OCR_AVAILABLE:
         print('WARNING: OCR dependencies not available.')
-        print('Install: pip install pdf2image pytesseract pillow  &&  sudo apt-get install tesseract-ocr poppler-utils')
-    for pdf_path in pdf_files:
-        print(f'\nProcessing: {pdf_path.name}')
-        data = process_pdf(pdf_path)
-        out_name = sanitize_filename(data['well_name']) + '.json'
-        out_path = OUTPUT_DIR / out_name
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f'  -> wrote: {out_path}')
-        print(f"  well_name={data.get('well_name')}")
-        print(f"  api_number={data.get('api_number')}")
-        print(f"  stimulation_records={len(data.get('stimulation_records', []))}")
+        print('Install: pip install pdf2image tesserocr pillow  &&  sudo apt-get install tesseract-ocr poppler-utils')
+    # Tesseract threads internally; cap it so N worker processes don't oversubscribe the cores.
+    # Workers are spawned (not forked) so they load Tesseract with the limit already in the env.
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    if OCR_AVAILABLE:
+        prune_ocr_cache()
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [(pdf_path, pool.submit(process_pdf, pdf_path)) for pdf_path in pdf_files]
+        for pdf_path, fut in futures:
+            try:
+                data = fut.result()
+            except Exception as exc:
+                # one bad PDF shouldn't take the rest of the batch down with it
+                print(f'\nFailed: {pdf_path.name} ({type(exc).__name__}: {exc})')
+                continue
+            write_output(data)
     print('\nDone.')
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()